@@ -2,12 +2,14 @@ import os
 import cv2
 import numpy as np
 import logging
+import zlib
 
-from collections import Counter
+from collections import Counter, OrderedDict
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
-from ..metrics.ms_ssim import multi_scale_match
-from ..utils.image import apply_overlay
+from ..log_config import VERBOSE_LEVEL_NUM
+from ..metrics.ms_ssim import multi_scale_match, prepare_template
+from ..utils.image import apply_overlay, get_overlays, load_overlays, ICON_EXTENSIONS
 
 
 from ..exceptions import SISTERError
@@ -15,6 +17,76 @@ from ..exceptions import SISTERError
 
 logger = logging.getLogger(__name__)
 
+# Trait groups carry no rarity overlay, so "common" matches skip the overlay sweep
+TRAIT_ICON_GROUPS = frozenset({
+    "Personal Space Traits",
+    "Personal Ground Traits",
+    "Starship Traits",
+    "Space Reputation",
+    "Ground Reputation",
+    "Active Space Reputation",
+    "Active Ground Reputation",
+})
+
+# Slot ROIs are matched at the wiki icon size (height, width)
+CANONICAL_ROI_SIZE = (47, 36)
+
+# Prepared match templates are reused across slots within each worker process
+MATCH_TEMPLATE_CACHE_SIZE = 4096
+_match_template_cache = OrderedDict()
+
+
+def get_match_template(name, icon_color, overlay_name, overlay_img, mask_type):
+    """
+    Return `icon_color` blended with `overlay_img` (if any) and prepared for
+    multi_scale_match, reusing earlier results.
+
+    The same icon is matched against every candidate slot, so the blended,
+    blurred and masked template is kept in a per-process LRU cache. The key
+    includes pixel checksums so an icon or overlay that changes on disk between
+    runs is never served stale.
+    """
+    key = (
+        name,
+        overlay_name,
+        mask_type,
+        icon_color.shape,
+        zlib.crc32(np.ascontiguousarray(icon_color)),
+        None if overlay_img is None else zlib.crc32(np.ascontiguousarray(overlay_img)),
+    )
+    template = _match_template_cache.get(key)
+    if template is None:
+        blended = icon_color if overlay_img is None else apply_overlay(icon_color, overlay_img)
+        template = prepare_template(blended, mask_type)
+        _match_template_cache[key] = template
+        if len(_match_template_cache) > MATCH_TEMPLATE_CACHE_SIZE:
+            _match_template_cache.popitem(last=False)
+    else:
+        _match_template_cache.move_to_end(key)
+    return template
+
+
+def normalize_roi(roi):
+    """
+    Resize a slot ROI to fit CANONICAL_ROI_SIZE.
+
+    Returns the resized ROI and the scale factor applied, or None when the ROI
+    already has the canonical size.
+    """
+    canon_h, canon_w = CANONICAL_ROI_SIZE
+    if roi.shape[0] == canon_h and roi.shape[1] == canon_w:
+        return roi, None
+
+    scale_factor = min(canon_h / roi.shape[0], canon_w / roi.shape[1])
+    resized = cv2.resize(
+        roi,
+        None,
+        fx=scale_factor,
+        fy=scale_factor,
+        interpolation=cv2.INTER_AREA,
+    )
+    return resized, scale_factor
+
 
 class IconDetector:
     def __init__(self, debug=False, on_progress=None, executor_pool=None):
@@ -35,7 +107,7 @@ class IconDetector:
             if not os.path.exists(folder):
                 continue
             for filename in os.listdir(folder):
-                if filename.lower().endswith((".png", ".jpg", ".jpeg")):
+                if filename.lower().endswith(ICON_EXTENSIONS):
                     path = os.path.join(folder, filename)
                     icon = cv2.imread(path, cv2.IMREAD_COLOR)
                     if icon is not None:
@@ -43,20 +115,7 @@ class IconDetector:
         return icons
 
     def load_overlays(self, overlay_folder):
-        overlays = {}
-        for name in [
-            "common.png",
-            "uncommon.png",
-            "rare.png",
-            "very rare.png",
-            "ultra rare.png",
-            "epic.png",
-        ]:
-            path = os.path.join(overlay_folder, name)
-            if os.path.exists(path):
-                overlay = cv2.imread(path, cv2.IMREAD_UNCHANGED)
-                overlays[name.split(".")[0]] = overlay
-        return overlays
+        return load_overlays(overlay_folder)
 
     def detect(
         self,
@@ -67,7 +126,8 @@ class IconDetector:
         filtered_icons,
         found_icons,
         threshold=0.7,
-        executor_pool=None
+        executor_pool=None,
+        overlay_dir=None,
     ):
         """
         Run icon detector using the selected engine.
@@ -80,6 +140,10 @@ class IconDetector:
 
         matches = {}
 
+        # Each slot ROI is resized once here rather than in every (icon, slot) task
+        normalized_rois = {}
+        task_overlays = overlays if overlay_dir is None else overlay_dir
+
         try:
             args_list = []
             self.on_progress("Detecting icons", 5.0)
@@ -117,8 +181,17 @@ class IconDetector:
 
                     detected_overlay = detected_overlays[idx]
 
+                    if (icon_group_label, idx) not in normalized_rois:
+                        normalized_rois[(icon_group_label, idx)] = normalize_roi(roi)
+                    slot_roi, scale_factor = normalized_rois[(icon_group_label, idx)]
+
                     logger.info(
-                        f"Matching {len(icons_for_slot)} icons into icon group '{icon_group_label}' at slot {idx} with overlay {detected_overlay[0]["overlay"]} at scale {detected_overlay[0]['scale']}"
+                        "Matching %d icons into icon group '%s' at slot %s with overlay %s at scale %s",
+                        len(icons_for_slot),
+                        icon_group_label,
+                        idx,
+                        detected_overlay[0]["overlay"],
+                        detected_overlay[0]["scale"],
                     )
 
                     
@@ -143,12 +216,13 @@ class IconDetector:
                         args = (
                             name,
                             idx,
-                            roi,
+                            slot_roi,
+                            scale_factor,
                             icon_color,
                             icons_for_slot[name]['metadata'].copy(),
                             detected_overlay,
                             threshold,
-                            overlays,
+                            task_overlays,
                             icon_group_label,
                             False,
                         )
@@ -212,8 +286,15 @@ class IconDetector:
 
                     detected_overlay = detected_overlays[idx]
 
+                    if (icon_group_label, idx) not in normalized_rois:
+                        normalized_rois[(icon_group_label, idx)] = normalize_roi(roi)
+                    slot_roi, scale_factor = normalized_rois[(icon_group_label, idx)]
+
                     logger.info(
-                        f"Fallback matching {len(icons_for_slot.keys())} icons into icon group '{icon_group_label}' at slot {idx}"
+                        "Fallback matching %d icons into icon group '%s' at slot %s",
+                        len(icons_for_slot),
+                        icon_group_label,
+                        idx,
                     )
 
                     for idx_icon, (name, icon_color) in enumerate(
@@ -228,12 +309,13 @@ class IconDetector:
                         args = (
                             name,
                             idx,
-                            roi,
+                            slot_roi,
+                            scale_factor,
                             icon_color,
                             icons_for_slot[name]['metadata'].copy(),
                             detected_overlay,
                             threshold,
-                            overlays,
+                            task_overlays,
                             icon_group_label,
                             True,
                         )
@@ -267,21 +349,19 @@ class IconDetector:
 
         self.on_progress("Finalising", 99.0)
 
-        match_count = 0
-        methods = {}
-        for icon_group in matches.keys():
-            for slot in matches[icon_group].keys():
-                match_count += len(matches[icon_group][slot])
-                for candidate in matches[icon_group][slot]:
-                    method = candidate["method"]
-                    methods[candidate["method"]] = (
-                        methods.get(candidate["method"], 0) + 1
-                    )
+        # The summary walks every candidate, so only build it when it will be logged
+        if logger.isEnabledFor(VERBOSE_LEVEL_NUM):
+            match_count = 0
+            methods = Counter()
+            for slots in matches.values():
+                for candidates in slots.values():
+                    match_count += len(candidates)
+                    methods.update(candidate["method"] for candidate in candidates)
 
-        logger.verbose(f"[IconDetector] Total matches: {match_count}")
+            logger.verbose("[IconDetector] Total matches: %d", match_count)
 
-        for method, count in methods.items():
-            logger.verbose(f"Summary: {count} matches via {method}")
+            for method, count in methods.items():
+                logger.verbose("Summary: %d matches via %s", count, method)
 
         if self.debug:
             debug_img = screenshot_color.copy()
@@ -299,6 +379,7 @@ def match_single_icon(args):
         name,
         slot_idx,
         roi,
+        scale_factor,
         icon_color,
         icon_metadata,
         detected_overlays,
@@ -308,6 +389,9 @@ def match_single_icon(args):
         fallback_mode,
     ) = args
 
+    if not isinstance(overlays, dict):
+        overlays = get_overlays(overlays)
+
     found_matches = []
     matched_candidate_indexes = set()
 
@@ -338,19 +422,6 @@ def match_single_icon(args):
         if not overlay or overlay not in overlays:
             return found_matches, matched_candidate_indexes, slot_idx
 
-        scale_factor = None
-
-        # if roi.shape[0] > 43 * 1.1 or roi.shape[1] > 33 * 1.1:
-        if roi.shape[0] != 47 or roi.shape[1] != 36:
-            scale_factor = min(47 / roi.shape[0], 36 / roi.shape[1])
-            roi = cv2.resize(
-                roi.copy(),
-                None,
-                fx=scale_factor,
-                fy=scale_factor,
-                interpolation=cv2.INTER_AREA,
-            )
-
         best_match = None
         method = "ssim-all-overlays-all-scales-fallback"
         overlay_used = overlay
@@ -358,26 +429,30 @@ def match_single_icon(args):
         if overlay == "common":
             best_score = -np.inf
 
-            if icon_group_label in ("Personal Space Traits", "Personal Ground Traits", "Starship Traits", "Space Reputation", "Ground Reputation", "Active Space Reputation", "Active Ground Reputation"):
+            if icon_group_label in TRAIT_ICON_GROUPS:
                 scales = np.linspace(0.6, 0.7, 11)
                 method = (
                     "ssim-detected-overlays-all-scales"
                 )
 
+                template = get_match_template(name, icon_color, None, None, mask_type)
                 best_match = multi_scale_match(
                     name,
                     roi,
-                    icon_color,
+                    template,
                     mask_type,
                     scales=scales,
                     threshold=threshold,
+                    template_prepared=True,
                 )
 
             else:
                 for overlay_name, overlay_img in overlays.items():
-                    blended_icon = apply_overlay(icon_color, overlay_img)
+                    template = get_match_template(
+                        name, icon_color, overlay_name, overlay_img, mask_type
+                    )
                     match = multi_scale_match(
-                        name, roi, blended_icon, mask_type, threshold=threshold
+                        name, roi, template, mask_type, threshold=threshold, template_prepared=True
                     )
 
                     if match and match[2] > best_score:
@@ -388,7 +463,9 @@ def match_single_icon(args):
 
             # print(f"overlay==common: best_match: {best_match} best_score: {best_score} overlay_used:{overlay_used}")
         else:
-            blended_icon = apply_overlay(icon_color, overlays[overlay])
+            template = get_match_template(
+                name, icon_color, overlay, overlays[overlay], mask_type
+            )
             icon_h, icon_w = icon_color.shape[:2]
             overlay_h, overlay_w = overlays[overlay].shape[:2]
 
@@ -405,16 +482,17 @@ def match_single_icon(args):
                 best_match = multi_scale_match(
                     name,
                     roi,
-                    blended_icon,
+                    template,
                     mask_type,
                     scales=scales,
                     steps=overlay_steps,
                     threshold=threshold,
+                    template_prepared=True,
                 )
             else:
                 method = "ssim-detected-overlay-all-scales-fallback"
                 best_match = multi_scale_match(
-                    name, roi, blended_icon, mask_type, threshold=threshold
+                    name, roi, template, mask_type, threshold=threshold, template_prepared=True
                 )
 
             # print(f"overlay!=common: best_match: {best_match} scales: {scales} method: {method}")
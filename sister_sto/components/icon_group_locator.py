@@ -1264,8 +1264,7 @@ class IconGroupLocator:
         # print(f"image.shape: {image.shape}")
         # print(f"IconGroups: {icon_groups}")
         for label, entry in icon_groups.items():
-            print(f"Label: {label}")
-            print(f"Entry: {entry}")
+            logger.debug("Drawing icon group %s: %s", label, entry)
             x1, y1 = entry["IconGroup"]["top_left"]
             x2, y2 = entry["IconGroup"]["bottom_right"]
             color = [random.randint(0, 255) for _ in range(3)]
@@ -1,18 +1,17 @@
 import cv2
 import numpy as np
 import logging
-import traceback
 
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from multiprocessing import shared_memory
-from skimage.metrics import structural_similarity as ssim
+from ..metrics.ssim import structural_similarity as ssim
 
 from imagehash import hex_to_hash
 import imagehash
 from PIL import Image
 
 
-from ..utils.image import show_image
+from ..utils.image import get_overlays, show_image
 from ..metrics.barcode import find_off_strips, compare_barcodes
 from ..metrics.mean_hue import classify_overlay_by_patch
 
@@ -38,7 +37,8 @@ class IconOverlayDetector:
         icon_slots,
         overlays,
         threshold=0.8,
-        executor_pool=None
+        executor_pool=None,
+        overlay_dir=None,
     ):
         """
         Run icon detector using the selected engine.
@@ -55,6 +55,7 @@ class IconOverlayDetector:
 
         args_list = []
         icon_group_slot_index = []
+        task_overlays = overlays if overlay_dir is None else overlay_dir
 
         for icon_group_label in icon_slots:
             for slot in icon_slots[icon_group_label]:
@@ -66,10 +67,12 @@ class IconOverlayDetector:
                 #     continue
 
                 logger.debug(
-                    f"Running overlay detection for icon group '{icon_group_label}', slot {idx}"
+                    "Running overlay detection for icon group '%s', slot %s",
+                    icon_group_label,
+                    idx,
                 )
 
-                args_list.append((roi, overlays))
+                args_list.append((roi, task_overlays))
                 icon_group_slot_index.append((icon_group_label, idx))
 
 
@@ -104,9 +107,12 @@ class IconOverlayDetector:
                     detected_overlays_by_icon_group.setdefault(label, {})[idx] = result
                 except Exception as e:
                     logger.warning(
-                        f"Overlay detection failed for icon group '{label}', slot {idx}: {e}"
+                        "Overlay detection failed for icon group '%s', slot %s: %s",
+                        label,
+                        idx,
+                        e,
+                        exc_info=True,
                     )
-                    traceback.print_exc()
                 args_completed += 1
                 
                 if args_completed % 10 == 0 or args_completed == args_total:
@@ -134,6 +140,9 @@ def identify_overlay(
 ):
     debug = True
 
+    if not isinstance(overlays, dict):
+        overlays = get_overlays(overlays)
+
     def overlay_mask(overlay_type, shape, box_width=8):
         """
         Returns an H×W float mask that is 1 inside the bottom-left box
@@ -226,12 +235,16 @@ def identify_overlay(
 
     overlay_detections = []
 
+    # Loop invariants: the inspection flag and region size are fixed per call
+    inspect = must_inspect(inspection_list, icon_group_label, slot)
+    H, W = region_crop.shape[:2]
+
     for overlay_name, overlay in reversed(list(overlays.items())):
         if overlay_name == "common":
             continue
 
         # logger.debug(f"Trying overlay {overlay_name}")
-        if must_inspect(inspection_list, icon_group_label, slot):
+        if inspect:
             print(
                 f"{icon_group_label}#{slot}: {overlay_name}: Begin: overlay=[{overlay.shape}] region=[{region_crop.shape}]"
             )
@@ -242,35 +255,55 @@ def identify_overlay(
         # Barcode Overlay setup
         barcode_overlay = roi_crop(overlay_rgb.copy(), barcode_width)
 
-        # barcode_overlay_common_segments = find_common_off_segments(barcode_overlay,
-        #                                   ignore_top_frac=0.1,
-        #                                   ignore_top_rows=0,
-        #                                   tolerance_rows=1)
-        (
-            barcode_overlay_detected_overlay_by_patch,
-            h_deg,
-        ) = classify_overlay_by_patch(barcode_overlay)
-
-        # Barcode Region setup
-        barcode_region = roi_crop(region_crop.copy(), barcode_width)
-
-        # barcode_region_common_segments = find_common_off_segments(barcode_region,
-        #                                   ignore_top_frac=0.1,
-        #                                   ignore_top_rows=0,
-        #                                   tolerance_rows=1)
-
-        # barcode_match, barcode_overlay_common_segments, barcode_region_common_segments = compare_barcodes_simple(barcode_overlay, barcode_region)
-        (
-            barcode_match,
-            barcode_overlay_common_segments,
-            barcode_region_common_segments,
-        ) = compare_barcodes(barcode_overlay, barcode_region)
-        barcode_overlay_stripes = len(barcode_overlay_common_segments)
-        barcode_region_stripes = len(barcode_region_common_segments)
-
-        # diff = compare_patches(barcode_region, barcode_overlay)
-
-        if must_inspect(inspection_list, icon_group_label, slot):
+        # The binarised, padded overlay barcode only depends on the overlay, so
+        # build it once here rather than for every scale and offset
+        barcode_overlay_binarized = cv2.adaptiveThreshold(
+            cv2.cvtColor(barcode_overlay, cv2.COLOR_BGR2GRAY),
+            255,
+            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY,
+            11,
+            2,
+        )
+        barcode_overlay_ssim = cv2.copyMakeBorder(
+            barcode_overlay_binarized,
+            top=0,
+            bottom=0,
+            left=0,
+            right=7,
+            borderType=cv2.BORDER_CONSTANT,
+            value=0,
+        )
+
+        if inspect:
+            # barcode_overlay_common_segments = find_common_off_segments(barcode_overlay,
+            #                                   ignore_top_frac=0.1,
+            #                                   ignore_top_rows=0,
+            #                                   tolerance_rows=1)
+            (
+                barcode_overlay_detected_overlay_by_patch,
+                h_deg,
+            ) = classify_overlay_by_patch(barcode_overlay)
+
+            # Barcode Region setup
+            barcode_region = roi_crop(region_crop.copy(), barcode_width)
+
+            # barcode_region_common_segments = find_common_off_segments(barcode_region,
+            #                                   ignore_top_frac=0.1,
+            #                                   ignore_top_rows=0,
+            #                                   tolerance_rows=1)
+
+            # barcode_match, barcode_overlay_common_segments, barcode_region_common_segments = compare_barcodes_simple(barcode_overlay, barcode_region)
+            (
+                barcode_match,
+                barcode_overlay_common_segments,
+                barcode_region_common_segments,
+            ) = compare_barcodes(barcode_overlay, barcode_region)
+            barcode_overlay_stripes = len(barcode_overlay_common_segments)
+            barcode_region_stripes = len(barcode_region_common_segments)
+
+            # diff = compare_patches(barcode_region, barcode_overlay)
+
             print(
                 f"{icon_group_label}#{slot}: {overlay_name}: Scale: Barcode spatial match: {barcode_match}"
             )
@@ -299,29 +332,27 @@ def identify_overlay(
                 fy=scale,
                 interpolation=cv2.INTER_LINEAR,
             )
-            resized_alpha = cv2.resize(
-                orig_mask,
-                (resized_rgb.shape[1], resized_rgb.shape[0]),
-                interpolation=cv2.INTER_LINEAR,
-            )
-
+            # The alpha and the mask are the same resize of orig_mask
             resized_mask = cv2.resize(
                 orig_mask,
                 (resized_rgb.shape[1], resized_rgb.shape[0]),
                 interpolation=cv2.INTER_LINEAR,
             )
-            final_alpha = resized_alpha * resized_mask
+            final_alpha = resized_mask * resized_mask
+            final_alpha_3 = final_alpha[..., np.newaxis]
+
+            # The masked overlay is the same for every offset at this scale
+            masked_overlay = (resized_rgb * final_alpha_3).astype(np.uint8)
 
             h, w = resized_rgb.shape[:2]
-            H, W = region_crop.shape[:2]
 
-            if must_inspect(inspection_list, icon_group_label, slot):
+            if inspect:
                 print(
                     f"{icon_group_label}#{slot}: {overlay_name}: Scale: Begin : scale=[{scale}], overlay=[{resized_rgb.shape}], region=[{region_crop.shape}], original_region=[{original_region_crop_shape}]"
                 )
 
             if h > H or w > W:
-                if must_inspect(inspection_list, icon_group_label, slot):
+                if inspect:
                     print(
                         f"{icon_group_label}#{slot}: {overlay_name}: Scale: Skipping: scale=[{scale}], overlay=[{resized_rgb.shape}], region=[{region_crop.shape}]"
                     )
@@ -343,12 +374,7 @@ def identify_overlay(
                     # print(f"{icon_group_label}#{slot}: {overlay_name}: {step_count_y}/{step_limit} {step_count_x}/{step_limit}")
                     roi = region_crop[y : y + h, x : x + w]
 
-                    masked_region = (roi * final_alpha[..., np.newaxis]).astype(
-                        np.uint8
-                    )
-                    masked_overlay = (
-                        resized_rgb * final_alpha[..., np.newaxis]
-                    ).astype(np.uint8)
+                    masked_region = (roi * final_alpha_3).astype(np.uint8)
 
                     # print(f"Shapes: region_crop: {region_crop.shape}, roi: {roi.shape}, masked_region: {masked_region.shape}, masked_overlay: {masked_overlay.shape}")
                     barcode_region = roi_crop(
@@ -376,9 +402,7 @@ def identify_overlay(
                     barcode_overlay_stripes = len(barcode_overlay_common_segments)
                     barcode_region_stripes = len(barcode_region_common_segments)
 
-                    if not barcode_match and not must_inspect(
-                        inspection_list, icon_group_label, slot
-                    ):
+                    if not barcode_match and not inspect:
                         # print(f"{icon_group_label}#{slot}: Skipping due to mismatched barcodes: {overlay_name}: {barcode_overlay_stripes} vs {barcode_region_stripes}")
                         continue
                     # else:
@@ -398,14 +422,6 @@ def identify_overlay(
                         11,
                         2,
                     )
-                    barcode_overlay_binarized = cv2.adaptiveThreshold(
-                        cv2.cvtColor(barcode_overlay, cv2.COLOR_BGR2GRAY),
-                        255,
-                        cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                        cv2.THRESH_BINARY,
-                        11,
-                        2,
-                    )
 
                     try:
                         barcode_region_ssim = cv2.copyMakeBorder(
@@ -417,27 +433,21 @@ def identify_overlay(
                             borderType=cv2.BORDER_CONSTANT,
                             value=0,
                         )
-                        barcode_overlay_ssim = cv2.copyMakeBorder(
-                            barcode_overlay_binarized,
-                            top=0,
-                            bottom=0,
-                            left=0,
-                            right=7,
-                            borderType=cv2.BORDER_CONSTANT,
-                            value=0,
-                        )
 
                         # if must_inspect(inspection_list, icon_group_label, slot):
                         #     show_image([barcode_region_ssim, barcode_overlay_ssim])
 
                         score = ssim(barcode_region_ssim, barcode_overlay_ssim)
                     except ValueError:
-                        print(
-                            f"{icon_group_label}#{slot}: Skipping due to ValueError: {overlay_name}"
+                        logger.debug(
+                            "%s#%s: Skipping due to ValueError: %s",
+                            icon_group_label,
+                            slot,
+                            overlay_name,
                         )
                         continue
 
-                    if must_inspect(inspection_list, icon_group_label, slot):
+                    if inspect:
                         barcode_region_binarized = cv2.adaptiveThreshold(
                             cv2.cvtColor(barcode_region, cv2.COLOR_BGR2GRAY),
                             255,
@@ -488,7 +498,7 @@ def identify_overlay(
                         print()
 
                     if score > 0.75 and score > best_score:
-                        if must_inspect(inspection_list, icon_group_label, slot):
+                        if inspect:
                             if not barcode_match:
                                 continue
                             if (
@@ -33,7 +33,7 @@ class IconSlotLocator:
 
         # Esnure debug output directory exists
         if self.debug and self.debug_output_path:
-            print(f"Saving debug output to {self.debug_output_path}")
+            logger.debug("Saving debug output to %s", self.debug_output_path)
             base, _ = os.path.splitext(self.debug_output_path)
             os.makedirs(os.path.dirname(base), exist_ok=True)
 
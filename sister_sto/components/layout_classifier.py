@@ -286,7 +286,7 @@ class LayoutClassifier:
                 if label in labels
             )
             score += presence_score
-            logger.debug(f"Presence score: {presence_score}")
+            logger.debug("Presence score: %s", presence_score)
 
         if 'trait_box' in rule_set and rule_set['trait_box'] is True:
             is_required = True
@@ -294,7 +294,7 @@ class LayoutClassifier:
         for bonus in rule_set.get("bonuses", []):
             if bonus["label"] in labels:
                 score += bonus["score"]
-                logger.debug(f"Bonus for {bonus['label']}: +{bonus['score']}")
+                logger.debug("Bonus for %s: +%s", bonus["label"], bonus["score"])
 
         for cond in rule_set.get("conditions", []):
             if cond["type"] == "vertical_stack":
@@ -302,24 +302,24 @@ class LayoutClassifier:
                     labels, cond["labels"], align=cond.get("align", "left")
                 ):
                     score += cond["score"]
-                    logger.debug(f"Vertical stack matched: +{cond['score']}")
+                    logger.debug("Vertical stack matched: +%s", cond["score"])
 
             elif cond["type"] == "labels_vertically_between":
                 if self._labels_vertically_between(
                     labels, cond["label1"], cond["label2"], cond["group"]
                 ):
                     score += cond["score"]
-                    logger.debug(f"Labels vertically between matched: +{cond['score']}")
+                    logger.debug("Labels vertically between matched: +%s", cond["score"])
 
             elif cond["type"] == "is_left_of":
                 if self._is_left_of(labels, cond["left"], cond["right"]):
                     score += cond["score"]
-                    logger.debug(f"Left-of condition matched: +{cond['score']}")
+                    logger.debug("Left-of condition matched: +%s", cond["score"])
 
             elif cond["type"] == "horizontal_alignment":
                 if self._check_horizontal_alignment(labels, cond["labels"]):
                     score += cond["score"]
-                    logger.debug(f"Horizontal alignment matched: +{cond['score']}")
+                    logger.debug("Horizontal alignment matched: +%s", cond["score"])
 
         return score, is_required
 
@@ -343,7 +343,7 @@ class LayoutClassifier:
         coords = []
         for label in required_labels:
             if label not in labels:
-                logger.debug(f"Vertical stack: Missing label '{label}'")
+                logger.debug("Vertical stack: Missing label '%s'", label)
                 return False
             coords.append(
                 labels[label]["top_left"]
@@ -356,14 +356,14 @@ class LayoutClassifier:
         for i in range(len(coords_sorted) - 1):
             x1, y1 = coords_sorted[i]
             x2, y2 = coords_sorted[i + 1]
-            logger.debug(f"Vertical stack check: ({x1},{y1}) to ({x2},{y2})")
+            logger.debug("Vertical stack check: (%s,%s) to (%s,%s)", x1, y1, x2, y2)
             if abs(x1 - x2) > self.VERTICAL_TOLERANCE:
                 logger.debug(
-                    f"Vertical stack: X-alignment failed with diff {abs(x1 - x2)}"
+                    "Vertical stack: X-alignment failed with diff %s", abs(x1 - x2)
                 )
                 return False
             if y2 <= y1:
-                logger.debug(f"Vertical stack: Y-ordering failed with y1={y1}, y2={y2}")
+                logger.debug("Vertical stack: Y-ordering failed with y1=%s, y2=%s", y1, y2)
                 return False
 
         return True
@@ -437,7 +437,7 @@ class LayoutClassifier:
         """
         if label1 not in labels or label2 not in labels:
             logger.debug(
-                f"Missing label(s) in _labels_vertically_between: {label1}, {label2}"
+                "Missing label(s) in _labels_vertically_between: %s, %s", label1, label2
             )
             return False
 
@@ -460,10 +460,20 @@ class LayoutClassifier:
         ]
 
         logger.debug(
-            f"_labels_vertically_between: {label1} @ ({x1},{y1}), {label2} @ ({x2},{y2})"
+            "_labels_vertically_between: %s @ (%s,%s), %s @ (%s,%s)",
+            label1,
+            x1,
+            y1,
+            label2,
+            x2,
+            y2,
         )
         logger.debug(
-            f"Between {top_y} and {bottom_y}, found {len(intervening)} vertically aligned labels: {intervening}"
+            "Between %s and %s, found %d vertically aligned labels: %s",
+            top_y,
+            bottom_y,
+            len(intervening),
+            intervening,
         )
 
         return len(intervening) > 0
@@ -483,12 +493,12 @@ class LayoutClassifier:
         score = 0
         sets_labels = [k for k in labels if k.startswith("SETS")]
         score += 100 * len(sets_labels)
-        logger.debug(f"SETS Ship Build: SETS label bonus {100 * len(sets_labels)}")
+        logger.debug("SETS Ship Build: SETS label bonus %d", 100 * len(sets_labels))
 
         required = ["Fore Weapon", "Aft Weapon"]
         presence_score = sum(10 for label in required if label in labels)
         score += presence_score
-        logger.debug(f"SETS Ship Build: Presence score {presence_score}")
+        logger.debug("SETS Ship Build: Presence score %s", presence_score)
         if self._check_vertical_stack(labels, required, align="left"):
             score += 50
             logger.debug("SETS Ship Build: Vertical stack matched")
@@ -507,12 +517,12 @@ class LayoutClassifier:
         score = 0
         sets_labels = [k for k in labels if k.startswith("SETS")]
         score += 100 * len(sets_labels)
-        logger.debug(f"SETS Ground Build: SETS label bonus {100 * len(sets_labels)}")
+        logger.debug("SETS Ground Build: SETS label bonus %d", 100 * len(sets_labels))
 
         required = ["Kit Module", "Weapon"]
         presence_score = sum(10 for label in required if label in labels)
         score += presence_score
-        logger.debug(f"SETS Ground Build: Presence score {presence_score}")
+        logger.debug("SETS Ground Build: Presence score %s", presence_score)
         if self._check_vertical_stack(labels, required, align="left"):
             score += 50
             logger.debug("SETS Ground Build: Vertical stack matched")
@@ -8,6 +8,7 @@ from collections import Counter
 
 from ..exceptions import PrefilterError
 
+from ..log_config import VERBOSE_LEVEL_NUM
 from ..utils.image import show_image
 
 import logging
@@ -16,6 +17,12 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Maximum Hamming distance for a candidate icon, per hash type
+HASH_MAX_DISTANCE = {
+    "phash": 18,
+    "dhash": 10,
+}
+
 
 class HashEngine:
     """
@@ -113,21 +120,18 @@ class HashEngine:
                     roi_dhash = slot["dhash"]
 
                     logger.debug(
-                        f"Prefiltering icons for icon group '{icon_group_label}' at slot {idx}"
+                        "Prefiltering icons for icon group '%s' at slot %s",
+                        icon_group_label,
+                        idx,
                     )
 
                     found_icons[icon_group_label][idx] = {}
                     filtered_icons[icon_group_label][box] = {}
 
-                    distance_config = {
-                        "phash": {"max_distance": 18 },
-                        "dhash": {"max_distance": 10 },
-                    }
-                    
                     for hash in ("phash", "dhash"):
                         try:
                             results = self.hash_index.find_similar_to_image(
-                                hash, slot[hash], categories, max_distance=distance_config[hash]["max_distance"], top_n=None, grayscale=False #, filters={"image_category": ",".join(categories)}
+                                hash, slot[hash], categories, max_distance=HASH_MAX_DISTANCE[hash], top_n=None, grayscale=False #, filters={"image_category": ",".join(categories)}
                             )
                             target_hashes[icon_group_label][hash].append(slot[hash])
                             #print(f"hash_index.find_similar_to_image: {results}")
@@ -292,14 +296,19 @@ class HashEngine:
 
 
                 logger.debug(
-                    f"Prefiltered {len(prefiltered[icon_group_label][idx])} icons for icon group '{icon_group_label}' at slot {idx}."
+                    "Prefiltered %d icons for icon group '%s' at slot %s.",
+                    len(prefiltered[icon_group_label][idx]),
+                    icon_group_label,
+                    idx,
                 )
 
         self.on_progress("Complete", 100.0)
 
-        logger.verbose(
-            f"Total icons prefiltered: {sum(len(slots) for icon_group in prefiltered.values() for slots in icon_group.values())}"
-        )
+        if logger.isEnabledFor(VERBOSE_LEVEL_NUM):
+            logger.verbose(
+                "Total icons prefiltered: %d",
+                sum(len(slots) for icon_group in prefiltered.values() for slots in icon_group.values()),
+            )
         logger.verbose("Completed prefiltering all candidates.")
 
         return prefiltered, found_icons
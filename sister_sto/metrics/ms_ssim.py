@@ -1,10 +1,48 @@
 import cv2
 import numpy as np
 
-from skimage.metrics import structural_similarity as ssim
+from .ssim import ssim_statistics, structural_similarity as ssim
 
 from ..utils.image import apply_mask, show_image
 
+# Offsets per scale that are scored with SSIM after the cross-correlation pass
+PRESCREEN_TOP_K = 8
+
+
+def ranked_offsets(region, template, top_k=None):
+    """
+    Return (x, y) offsets of `template` within `region` for the SSIM scan.
+
+    With `top_k`, every offset is scored in one cv2.matchTemplate pass
+    (TM_CCOEFF_NORMED) and only the `top_k` best are returned, best first.
+    Without it, all offsets are returned in raster order.
+    """
+    th, tw = template.shape[:2]
+    # Same offsets the exhaustive scan has always visited
+    rows = region.shape[0] - th
+    cols = region.shape[1] - tw
+    if rows <= 0 or cols <= 0:
+        return []
+
+    if top_k is None or top_k >= rows * cols:
+        return [(x, y) for y in range(rows) for x in range(cols)]
+
+    response = cv2.matchTemplate(region, template, cv2.TM_CCOEFF_NORMED)
+    response = np.nan_to_num(response[:rows, :cols], nan=-1.0).ravel()
+
+    best = np.argpartition(response, -top_k)[-top_k:]
+    best = best[np.argsort(response[best])[::-1]]
+    return [(int(i % cols), int(i // cols)) for i in best]
+
+
+def prepare_template(template_color, mask_type):
+    """
+    Blur and mask a template the way multi_scale_match compares it.
+    """
+    if mask_type == 'reputation_trait_type':
+        return apply_mask(cv2.GaussianBlur(template_color, (5, 5), 2), mask_type)
+    return apply_mask(cv2.GaussianBlur(template_color, (3, 3), 0), mask_type)
+
 
 def multi_scale_match(
     name,
@@ -14,7 +52,18 @@ def multi_scale_match(
     scales=np.linspace(0.6, 0.7, 11),
     steps=None,
     threshold=0.7,
+    prescreen_top_k=PRESCREEN_TOP_K,
+    template_prepared=False,
 ):
+    """
+    Find the best SSIM match of `template_color` in `region_color` over `scales`.
+
+    When `steps` gives a known (x, y) offset it is tried first. Otherwise the
+    region is scanned; `prescreen_top_k` limits SSIM to the strongest
+    cross-correlation candidates per scale, or None scores every offset.
+    Pass `template_prepared=True` when the template already went through
+    prepare_template, so it can be cached and reused across regions.
+    """
     best_val = -np.inf
     best_match = None
     best_loc = None
@@ -22,11 +71,9 @@ def multi_scale_match(
 
     # print(f"Region shape: {region_color.shape}, template shape: {template_color.shape}, scales: {scales}, threshold: {threshold}")
     region_color = apply_mask(cv2.GaussianBlur(region_color, (3, 3), 0), mask_type)
-    
-    if mask_type == 'reputation_trait_type':
-        template_color = apply_mask(cv2.GaussianBlur(template_color, (5, 5), 2), mask_type)
-    else:
-        template_color = apply_mask(cv2.GaussianBlur(template_color, (3, 3), 0), mask_type)
+
+    if not template_prepared:
+        template_color = prepare_template(template_color, mask_type)
 
     for scale in scales:
         resized_template = cv2.resize(
@@ -36,6 +83,9 @@ def multi_scale_match(
         if th > region_color.shape[0] or tw > region_color.shape[1]:
             continue
 
+        # The template side of SSIM is the same for every offset at this scale
+        template_stats = ssim_statistics(resized_template)
+
         found_by_detected_stepping = False
 
         if steps:
@@ -49,7 +99,7 @@ def multi_scale_match(
             #     show_image([region_color, roi, resized_template])
 
             try:
-                s = ssim(roi, resized_template, channel_axis=-1)
+                s = ssim(roi, resized_template, channel_axis=-1, im2_stats=template_stats)
             except ValueError:
                 continue
 
@@ -69,36 +119,21 @@ def multi_scale_match(
             #     print(f"Un-stepped match: {name} scale: {scale} Dimensions: w: {tw} h: {th}")
             #     show_image([region_color, resized_template])
 
-            # step_limit = 3
-            step_count_y = 0
-            for y in range(0, region_color.shape[0] - th, 1):
-                step_count_y += 1
-                # if step_count_y > step_limit:
-                #     break
-
-                step_count_x = 0
-                for x in range(0, region_color.shape[1] - tw, 1):
-                    if steps and x == steps[0] and y == steps[1]:
-                        continue
-                    # step_count_y += 1
-                    # if step_count_y > step_limit:
-                    #     break
-
-                    roi = region_color[y : y + th, x : x + tw]
-                    try:
-                        s = ssim(roi, resized_template, channel_axis=-1)
-                    except ValueError:
-                        continue
-
-                    # if s > threshold:
-                    # if name == "Anti-Time_Entanglement_Singularity.png":
-                    #     print(f"Stepped match: {name} scale: {scale} Stepping: x: {x} y: {y} Dimensions: w: {tw} h: {th} score: {s}")
-                    #     show_image([region_color, roi, resized_template])
-                    if s > best_val:
-                        best_val = s
-                        best_loc = (x, y)
-                        best_match = (tw, th)
-                        best_scale = scale
+            for x, y in ranked_offsets(region_color, resized_template, prescreen_top_k):
+                if steps and x == steps[0] and y == steps[1]:
+                    continue
+
+                roi = region_color[y : y + th, x : x + tw]
+                try:
+                    s = ssim(roi, resized_template, channel_axis=-1, im2_stats=template_stats)
+                except ValueError:
+                    continue
+
+                if s > best_val:
+                    best_val = s
+                    best_loc = (x, y)
+                    best_match = (tw, th)
+                    best_scale = scale
     if best_val >= threshold:
         return (
             best_loc,
@@ -5,7 +5,7 @@ from ..pipeline.core import PipelineStage, StageOutput, PipelineState
 from ..pipeline.progress_reporter import StageProgressReporter
 from ..components.icon_overlay_detector import IconOverlayDetector
 
-from ..utils.image import load_overlays
+from ..utils.image import get_overlays
 
 logger = logging.getLogger(__name__)
 
@@ -39,13 +39,15 @@ class DetectIconOverlaysStage(PipelineStage):
 
         report(self.name, "Running", 0.0)
 
-        overlays = load_overlays(ctx.app_config.get("overlay_dir", ""))
+        overlay_dir = ctx.app_config.get("overlay_dir", "")
+        overlays = get_overlays(overlay_dir)
 
         ctx.detected_overlays = self.strategy.detect(
             ctx.slots,
             overlays,
             threshold=self.opts.get("threshold", 0.8),
-            executor_pool=ctx.executor_pool
+            executor_pool=ctx.executor_pool,
+            overlay_dir=overlay_dir,
         )
         report(self.name, f"Completed - Matched {sum(1 for icon_group_dict in ctx.detected_overlays.values() for slot_items in icon_group_dict.values() for item in slot_items if item.get("overlay") != "common")} icon overlays", 100.0)
         return StageOutput(ctx, ctx.detected_overlays)
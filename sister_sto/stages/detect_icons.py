@@ -3,7 +3,7 @@ import logging
 
 from ..pipeline.core import PipelineStage, StageOutput, PipelineState
 from ..pipeline.progress_reporter import StageProgressReporter
-from ..utils.image import load_overlays
+from ..utils.image import get_overlays
 from ..components.icon_detector import IconDetector
 
 logger = logging.getLogger(__name__)
@@ -39,7 +39,8 @@ class DetectIconsStage(PipelineStage):
         report(self.name, "Starting", 0.0)
 
         icon_sets = ctx.app_config.get("icon_sets", {})
-        ctx.overlays = load_overlays(ctx.app_config.get("overlay_dir", ""))
+        overlay_dir = ctx.app_config.get("overlay_dir", "")
+        ctx.overlays = get_overlays(overlay_dir)
         
         ctx.matches = self.detector.detect(
             ctx.slots,
@@ -49,7 +50,8 @@ class DetectIconsStage(PipelineStage):
             ctx.loaded_icons,
             ctx.found_icons,
             threshold=self.opts.get("threshold", 0.7),
-            executor_pool=ctx.executor_pool
+            executor_pool=ctx.executor_pool,
+            overlay_dir=overlay_dir,
         )
         report(self.name, f"Completed - Matched {sum(1 for icon_group_dict in ctx.matches.values() for slot_items in icon_group_dict.values() for item in slot_items)} icons", 100.0)
         return StageOutput(ctx, ctx.matches)
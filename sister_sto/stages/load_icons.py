@@ -30,12 +30,21 @@ class LoadIconsStage(PipelineStage):
         start_pct = 1.0
         end_pct   = 90.0
 
+        icon_dir = ctx.app_config.get("icon_dir")
+
         download_icons = {}
+        # The same icon is usually a candidate for many slots; only stat it once
+        checked_paths = set()
         for icon_group in ctx.found_icons:
             for slot in ctx.found_icons[icon_group]:
                 for file in ctx.found_icons[icon_group][slot]:
                     for metadata in ctx.found_icons[icon_group][slot][file]['metadata']:
-                        full_path = ctx.app_config.get("icon_dir") / metadata['image_path']
+                        image_path = metadata['image_path']
+                        if image_path in checked_paths:
+                            continue
+                        checked_paths.add(image_path)
+
+                        full_path = icon_dir / image_path
 
                         if full_path.exists():
                              continue
@@ -84,13 +93,15 @@ class LoadIconsStage(PipelineStage):
                     )
 
                     cargo_filter = download_icons[cargo_type][destination_dir][cargo_filters]
-                    dest_dir = ctx.app_config.get("icon_dir") / destination_dir
+                    dest_dir = icon_dir / destination_dir
 
                     downloader.download_icons(cargo_type, dest_dir, image_cache_path, cargo_filter, on_progress=reporter)
                     
                     cargo_filters_processed += 1
                     
 
+        downloader.close()
+
         ctx.loaded_icons = {}
 
         sub = f"Loading icons"
@@ -112,7 +123,7 @@ class LoadIconsStage(PipelineStage):
                     if file not in ctx.loaded_icons[icon_group]:
                             # print(f"{icon_group}#{slot} {file}: {ctx.found_icons[icon_group][slot][file]}")
 
-                            full_path = ctx.app_config.get("icon_dir") / file
+                            full_path = icon_dir / file
                             data = np.fromfile(normalize_path(full_path), dtype=np.uint8)
                             icon = cv2.imdecode(data, cv2.IMREAD_COLOR)
                             
@@ -102,4 +102,6 @@ class DownloadAllIconsTask(PipelineTask):
             dest_dir = images_root / subdir
             downloader.download_icons(cargo_type, dest_dir, image_cache_path, filters, on_progress=reporter)
             
-            reporter("Completed", 100.0)
\ No newline at end of file
+            reporter("Completed", 100.0)
+
+        downloader.close()
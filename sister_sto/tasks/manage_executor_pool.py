@@ -5,6 +5,7 @@ from ..pipeline.core import PipelineTask, TaskOutput, PipelineState
 from ..pipeline.progress_reporter import StageProgressReporter
 
 from ..utils.persistent_executor import PersistentProcessPoolExecutor
+from ..utils.image import get_overlays
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +26,11 @@ class StartExecutorPoolTask(PipelineTask):
         report: Callable[[str, str, float], None]
     ) -> TaskOutput:
         report(self.name, "Starting executor pool", 0.0)
-        ctx.executor_pool = PersistentProcessPoolExecutor()
+        # Workers load the overlays once at startup; tasks then refer to them by folder
+        ctx.executor_pool = PersistentProcessPoolExecutor(
+            initializer=get_overlays,
+            initargs=(self.app_config.get("overlay_dir", ""),),
+        )
 
         total = ctx.executor_pool._executor._max_workers
         count = 0
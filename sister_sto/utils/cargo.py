@@ -3,11 +3,13 @@ import os
 import time
 import re
 import html
+import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
 import requests
 
 from ..exceptions import CargoError, CargoCacheIOError, CargoDownloadError
+from ..utils.hashindex import compile_filters, item_matches
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
@@ -23,6 +25,8 @@ FILE_PATH_BASE = "https://stowiki.net/wiki/Special:FilePath/"
 
 DEFAULT_CACHE_DIR = Path(os.path.expanduser("~")) / ".sto-cargo-cache"
 CACHE_EXPIRE_DAYS = 7
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+HTTP_POOL_SIZE = 32  # matches the ThreadPoolExecutor worker cap used for icon downloads
 
 CARGO_TYPES = {
     "equipment": {
@@ -53,6 +57,12 @@ CARGO_TYPES = {
     },
 }
 
+# Item name clean-up applied before building icon filenames
+INFINITY_RE = re.compile(r"\s*(∞)\s*", re.IGNORECASE)
+MODIFIER_SUFFIX_RE = re.compile(r"(\s*\[[^\]]+\](x\d+)*)+$")
+MARK_SUFFIX_RE = re.compile(r"\s*(Mk [IVXLCDM]+)$", re.IGNORECASE)
+UNSAFE_FILENAME_CHARS_RE = re.compile(r"[\/\\:\*\?\"\<\>\|]")
+
 # Normalization rules per cargo type and field
 NORMALIZATION_RULES = {
     "equipment": {
@@ -90,6 +100,26 @@ class CargoDownloader:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"Using cache directory: {self.cache_dir}")
 
+        # One pooled session for every request to the wiki, so icon downloads
+        # reuse keep-alive connections instead of reconnecting per file
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self):
+        """
+        Close the pooled HTTP session and its connections.
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
     def build_url(self, cargo_type, offset=0):
         """
         Construct the CargoExport API URL for the specified cargo type and result offset.
@@ -179,7 +209,7 @@ class CargoDownloader:
             batch = None
 
             try:
-                response = requests.get(url, timeout=10)
+                response = self.session.get(url, timeout=10)
                 response.raise_for_status()
                 batch = response.json()
             except (ValueError, json.JSONDecodeError) as e:
@@ -270,38 +300,8 @@ class CargoDownloader:
 
         data = self.load(cargo_type)
 
-        def item_matches(item):
-            for key, raw_val in (filters or {}).items():
-                val = item.get(key)
-
-                # explicit None filter: only include items where val is None
-                if raw_val is None:
-                    if val is not None:
-                        return False
-                    continue
-
-                # normalize the filter values into a list
-                if isinstance(raw_val, str):
-                    parts = [p.strip() for p in raw_val.split(',') if p.strip()]
-                elif isinstance(raw_val, (list, tuple)):
-                    parts = list(raw_val)
-                else:
-                    parts = [raw_val]
-
-                # split into inclusions and exclusions
-                includes = [p for p in parts if not (isinstance(p, str) and p.startswith('!'))]
-                excludes = [p[1:] for p in parts if isinstance(p, str) and p.startswith('!')]
-
-                # if we have any includes, val must be one of them
-                if includes and val not in includes:
-                    return False
-                # if we have any excludes, val must _not_ be any of them
-                if excludes and val in excludes:
-                    return False
-
-            return True
-
-        matching_items = [item for item in data if item_matches(item)]
+        compiled_filters = compile_filters(filters)
+        matching_items = [item for item in data if item_matches(item, compiled_filters)]
 
         logger.info(
             f"Downloading {len(matching_items)} {cargo_type} icons into {dest_dir}..."
@@ -350,17 +350,17 @@ class CargoDownloader:
                 return
 
             name_unescaped = html.unescape(html.unescape(raw_name))
-            cleaned_name = re.sub(
-                r"\s*(∞)\s*", "", name_unescaped, flags=re.IGNORECASE
-            ).strip()
-            cleaned_name = re.sub(r"(\s*\[[^\]]+\](x\d+)*)+$", "", cleaned_name).strip()
-            cleaned_name = re.sub(
-                r"\s*(Mk [IVXLCDM]+)$", "", cleaned_name, flags=re.IGNORECASE
-            ).strip()
-            cleaned_name = re.sub(r"[\/\\:\*\?\"\<\>\|]", "_", cleaned_name).strip()
-
-            filename = cleaned_name.replace(" ", "_") + ("_(" + item["faction_suffix"] + ")" if "faction_suffix" in item else "") + ".png"
-            url = FILE_PATH_BASE + cleaned_name.replace(" ", "_") + ("_(" + item["faction_suffix"] + ")" if "faction_suffix" in item else "") + "_icon.png"
+            cleaned_name = INFINITY_RE.sub("", name_unescaped).strip()
+            cleaned_name = MODIFIER_SUFFIX_RE.sub("", cleaned_name).strip()
+            cleaned_name = MARK_SUFFIX_RE.sub("", cleaned_name).strip()
+            cleaned_name = UNSAFE_FILENAME_CHARS_RE.sub("_", cleaned_name).strip()
+
+            stem = cleaned_name.replace(" ", "_")
+            if "faction_suffix" in item:
+                stem = f"{stem}_({item['faction_suffix']})"
+
+            filename = f"{stem}.png"
+            url = f"{FILE_PATH_BASE}{stem}_icon.png"
             dest_path = dest_dir / filename
 
             local_counter = 0
@@ -380,27 +380,48 @@ class CargoDownloader:
                     local_counter += 1
 
             if dest_path.exists():
-                logger.verbose(f"  [Skip] {filename} already exists.")
+                logger.verbose("  [Skip] %s already exists.", filename)
                 if local_counter > 0 and local_counter % 20 == 0:
                     with cache_lock:
                         self._write_image_cache(image_cache_path, cache_entries)
                 return
 
             try:
-                response = requests.get(url)
+                response = self.session.get(url, stream=True, timeout=10)
+            except requests.RequestException as e:
+                logger.error(f"  [Error] {filename}: {e}")
+                raise CargoDownloadError(f"Failed to download {filename}") from e
+
+            with response:
                 if response.ok:
+                    # Stream to a uniquely named temporary file so an interrupted
+                    # download never leaves a truncated icon behind that would later
+                    # be skipped, and items sharing a filename never share a file.
                     try:
-                        with open(dest_path, "wb") as f:
-                            f.write(response.content)
-                    except Exception as e:
+                        part = tempfile.NamedTemporaryFile(
+                            dir=dest_dir, prefix=f"{stem}.", suffix=".part", delete=False
+                        )
+                    except OSError as e:
                         raise CargoCacheIOError(f"Failed to write {filename}") from e
 
-                    logger.verbose(f"  [Downloaded] {filename}")
+                    try:
+                        with part:
+                            for chunk in response.iter_content(
+                                chunk_size=DOWNLOAD_CHUNK_SIZE
+                            ):
+                                part.write(chunk)
+                        os.replace(part.name, dest_path)
+                    except requests.RequestException as e:
+                        logger.error(f"  [Error] {filename}: {e}")
+                        raise CargoDownloadError(f"Failed to download {filename}") from e
+                    except OSError as e:
+                        raise CargoCacheIOError(f"Failed to write {filename}") from e
+                    finally:
+                        Path(part.name).unlink(missing_ok=True)
+
+                    logger.verbose("  [Downloaded] %s", filename)
                 else:
-                    logger.verbose(f"  [Failed] {filename} ({response.status_code})")
-            except Exception as e:
-                logger.error(f"  [Error] {filename}: {e}")
-                raise CargoDownloadError(f"Failed to download {filename}") from e
+                    logger.verbose("  [Failed] %s (%s)", filename, response.status_code)
 
             if local_counter > 0 and local_counter % 20 == 0:
                 with cache_lock:
@@ -440,7 +461,7 @@ class CargoDownloader:
                     on_progress(f"Downloading icons -> {sub}", frac*100.0)
                     pass
             except KeyboardInterrupt:
-                print("\n[Abort] Keyboard interrupt received, shutting down...")
+                logger.warning("[Abort] Keyboard interrupt received, shutting down...")
                 executor.shutdown(wait=True, cancel_futures=True)
                 raise
 
@@ -7,7 +7,8 @@ import hashlib
 import cv2
 import numpy as np
 
-from typing import Any, Callable, Dict, List, Tuple, Optional
+from collections.abc import Hashable
+from typing import Any, Callable, Dict, List, Tuple, Optional, Union
 
 from pathlib import Path
 from datetime import datetime
@@ -110,17 +111,24 @@ def add_to_bktree(namespace, hash_str, rel_path, item):
     BK_TREE_RELPATHS[namespace][str(hash_obj)] = rel_path
 
 
-def item_matches(item: dict, filters: dict) -> bool:
+class CompiledFilters(tuple):
     """
-    Return True iff `item` (a metadata dict) satisfies the key→value filters.
+    Filters normalized by `compile_filters`: a tuple of (key, includes, excludes).
     """
-    for key, raw_val in (filters or {}).items():
-        val = item.get(key)
 
-        # explicit None filter: only include items where val is None
+
+def compile_filters(filters: Optional[Dict]) -> CompiledFilters:
+    """
+    Normalize key→value filters once so they can be applied to many items.
+
+    Returns CompiledFilters of (key, includes, excludes) frozenset triples. Both
+    sets are None for an explicit None filter, which only matches items where
+    the value is None.
+    """
+    compiled = []
+    for key, raw_val in (filters or {}).items():
         if raw_val is None:
-            if val is not None:
-                return False
+            compiled.append((key, None, None))
             continue
 
         # normalize the filter values into a list
@@ -132,8 +140,38 @@ def item_matches(item: dict, filters: dict) -> bool:
             parts = [raw_val]
 
         # split into inclusions and exclusions
-        includes = [p for p in parts if not (isinstance(p, str) and p.startswith('!'))]
-        excludes = [p[1:] for p in parts if isinstance(p, str) and p.startswith('!')]
+        includes = frozenset(p for p in parts if not (isinstance(p, str) and p.startswith('!')))
+        excludes = frozenset(p[1:] for p in parts if isinstance(p, str) and p.startswith('!'))
+        compiled.append((key, includes, excludes))
+
+    return CompiledFilters(compiled)
+
+
+def item_matches(item: Dict, filters: Union[Dict, CompiledFilters, None]) -> bool:
+    """
+    Return True iff `item` (a metadata dict) satisfies the key→value filters.
+
+    `filters` may be a raw filter dict or the output of `compile_filters`;
+    callers testing many items should compile once and pass that in.
+    """
+    if not isinstance(filters, CompiledFilters):
+        filters = compile_filters(filters)
+
+    for key, includes, excludes in filters:
+        val = item.get(key)
+
+        # explicit None filter: only include items where val is None
+        if includes is None:
+            if val is not None:
+                return False
+            continue
+
+        # set membership needs a hashable value; list values (e.g. from Cargo
+        # JSON) never equal a filter entry, so they only fail inclusions
+        if not isinstance(val, Hashable):
+            if includes:
+                return False
+            continue
 
         # if we have any includes, val must be one of them
         if includes and val not in includes:
@@ -166,6 +204,8 @@ def find_similar_in_namespace(
     if isinstance(target_hash, str):
         target_hash = hex_to_hash(target_hash)
 
+    compiled_filters = compile_filters(filters)
+
     # query the BK-tree; every `item` comes back as (hash_obj, entry_dict)
     raw_results = BK_TREE_MAP[namespace].find((target_hash, None), max_distance)
 
@@ -181,7 +221,7 @@ def find_similar_in_namespace(
         metadata = entry_dict.get("data", {})
 
         # if filters provided, drop metadata entries that don't match
-        if filters and not item_matches(metadata, filters):
+        if compiled_filters and not item_matches(metadata, compiled_filters):
             continue
 
         # build a unique key per (perceptual-hash + md5)
@@ -371,7 +411,7 @@ class HashIndex:
                 }
                 self.hashes[rel_path] = entry_data
                 updated += 1
-                logger.verbose(f"Updated hash for {rel_path}")
+                logger.verbose("Updated hash for %s", rel_path)
 
             except Exception as e:
                 logger.warning(f"Failed to hash {rel_path}: {e}")
@@ -380,7 +420,7 @@ class HashIndex:
         stale_keys = set(self.hashes.keys()) - found_files
         for key in stale_keys:
             del self.hashes[key]
-            logger.verbose(f"Removed stale hash entry: {key}")
+            logger.verbose("Removed stale hash entry: %s", key)
 
         self._save_cache()
         logger.info(
@@ -398,10 +438,12 @@ class HashIndex:
 
         self._load_image_cache()
 
-        files_total = len(list(self.base_dir.glob(pattern)))
+        # Walk the icon tree once; the list is reused for the progress total
+        paths       = list(self.base_dir.glob(pattern))
+        files_total = len(paths)
         files_done  = 0
 
-        for path in self.base_dir.glob(pattern):
+        for path in paths:
             rel_path = str(path.relative_to(self.base_dir))
             try:
                 mtime = os.path.getmtime(path)
@@ -417,35 +459,39 @@ class HashIndex:
                     logger.warning(f"Failed to load or incomplete image: {rel_path}")
                     continue
 
+                # Per-file metadata is identical for every overlay, so resolve the
+                # path parts, image cache entry and mask type once up front
+                filename    = Path(rel_path).name
+                category    = Path(rel_path).parent.as_posix()
+                cache_entry = self.image_cache.get(filename, {})
+
+                base_metadata = dict(self.metadata_map.get(rel_path, {}))
+                base_metadata.update({
+                    "image_category":  category,
+                    "image_path":      rel_path,
+                    "image_filename":  filename,
+                    "cargo_type":      cache_entry.get("cargo", ""),
+                    "cargo_item_name": cache_entry.get("name", ""),
+                    "cargo_filters":   cache_entry.get("filters", {}),
+                    "item_name":       cache_entry.get("cleaned_name", ""),
+                    "mask_type":       map_mask_type(category),
+                })
+
                 for overlay_name, overlay_image in overlays.items():
                     key = f"{rel_path}::{overlay_name}"
-                    filename = Path(rel_path).name
-                    category = Path(rel_path).parent.as_posix()
-
-                    metadata = dict(self.metadata_map.get(rel_path, {}))
-                    metadata.update({
-                        "image_category":  category,
-                        "image_path":      rel_path,
-                        "image_filename":  filename,
-                        "overlay_name":    overlay_name,
-                        "cargo_type":      self.image_cache.get(filename, {}).get("cargo", ""),
-                        "cargo_item_name": self.image_cache.get(filename, {}).get("name", ""),
-                        "cargo_filters":   self.image_cache.get(filename, {}).get("filters", {}),
-                        "item_name":       self.image_cache.get(filename, {}).get("cleaned_name", ""),
-                    })
-
-                    # decide mask_type
-                    metadata["mask_type"] = map_mask_type(category)
+
+                    metadata = dict(base_metadata, overlay_name=overlay_name)
 
                     blended = apply_overlay(image_bgr[:, :, :3], overlay_image)
                     masked  = apply_mask(blended.copy(), metadata["mask_type"])
                     _, buf = cv2.imencode(".png", masked)
-                    
-                    phash_val = compute_phash(buf.tobytes(),
+                    png_bytes = buf.tobytes()
+
+                    phash_val = compute_phash(png_bytes,
                                            size=self.match_size,
                                            grayscale=False)
 
-                    dhash_val = compute_dhash(buf.tobytes(),
+                    dhash_val = compute_dhash(png_bytes,
                                            size=self.match_size,
                                            grayscale=False)
 
@@ -465,13 +511,13 @@ class HashIndex:
                     self.hashes[key] = entry_data
                     found_keys.add(key)
                     updated += 1
-                    logger.verbose(f"Hashed {key}")
+                    logger.verbose("Hashed %s", key)
 
                 files_done += 1
 
                 if on_progress:
                     if files_done % 100 == 0 or files_done == files_total:
-                        on_progress(f"{files_done}/{files_total}: {metadata["image_category"]}", files_done / files_total*100)
+                        on_progress(f"{files_done}/{files_total}: {category}", files_done / files_total*100)
 
             except Exception as e:
                 logger.warning(f"Failed to hash overlays for {rel_path}: {e}")
@@ -483,7 +529,7 @@ class HashIndex:
         stale = set(self.hashes) - found_keys
         for key in stale:
             del self.hashes[key]
-            logger.verbose(f"Pruned stale entry: {key}")
+            logger.verbose("Pruned stale entry: %s", key)
 
         self._save_cache()
         logger.info(f"Overlay hash update complete: {updated} entries added/updated.")
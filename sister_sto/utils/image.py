@@ -63,18 +63,24 @@ def load_image(image_or_path, resize_fullhd=False):
     return image
 
 
+# Overlay images shipped with the app, in rarity order
+OVERLAY_FILENAMES = (
+    "common.png",
+    "uncommon.png",
+    "rare.png",
+    "very rare.png",
+    "ultra rare.png",
+    "epic.png",
+)
+
+# File suffixes accepted as icon images
+ICON_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+
 def load_overlays(overlay_folder):
     overlays = {}
-    filenames = [
-        "common.png",
-        "uncommon.png",
-        "rare.png",
-        "very rare.png",
-        "ultra rare.png",
-        "epic.png",
-    ]
-
-    for filename in filenames:
+
+    for filename in OVERLAY_FILENAMES:
         path = os.path.join(overlay_folder, filename)
         if not os.path.exists(path):
             logger.warning(f"Overlay not found: {filename}")
@@ -97,6 +103,26 @@ def load_overlays(overlay_folder):
     return overlays
 
 
+# Overlays loaded once per process, keyed by overlay folder
+_overlay_cache = {}
+
+
+def get_overlays(overlay_folder):
+    """
+    Return the overlays in `overlay_folder`, loading them once per process.
+
+    Executor workers run this as their pool initializer. Detector tasks can
+    then pass the overlay folder instead of the overlay images, and each worker
+    resolves it here without unpickling the images per task. The cache is
+    keyed by the folder's string form, so callers must pass the same value.
+    """
+    key = str(overlay_folder)
+    overlays = _overlay_cache.get(key)
+    if overlays is None:
+        overlays = _overlay_cache[key] = load_overlays(overlay_folder)
+    return overlays
+
+
 def show_image(
     imgs,
     window_name="Images",
@@ -304,11 +330,10 @@ def apply_overlay(template_color, overlay):
         overlay_alpha, (template_color.shape[1], template_color.shape[0])
     )
 
+    # Blend all three colour channels in one broadcast pass
+    alpha = overlay_alpha[:, :, np.newaxis]
     blended = np.zeros_like(template_color)
-    for c in range(3):
-        blended[:, :, c] = overlay_rgb[:, :, c] * overlay_alpha + template_color[
-            :, :, c
-        ] * (1 - overlay_alpha)
+    blended[:, :, :3] = overlay_rgb * alpha + template_color[:, :, :3] * (1 - alpha)
     return blended.astype(np.uint8)
 
 
@@ -365,31 +390,36 @@ def apply_mask(image, mask_type):
 
     h, w = image.shape[:2]
     mask = create_mask(w, h, mask_type)
-    for c in range(3):
-        image[:, :, c] = (image[:, :, c].astype(np.float32) * mask).astype(np.uint8)
+    # Scale all three channels in place, without a float copy of the image
+    colour = image[:, :, :3]
+    np.multiply(colour, mask[:, :, np.newaxis], out=colour, casting="unsafe")
     return image
 
 
+# Icon group labels and icon categories that use the trait masks
+REPUTATION_TRAIT_GROUPS = frozenset({
+    "Active Space Reputation",
+    "Active Ground Reputation",
+    "Space Reputation",
+    "Ground Reputation",
+    "space/traits/active_reputation",
+    "ground/traits/active_reputation",
+    "space/traits/reputation",
+    "ground/traits/reputation",
+})
+
+PERSONAL_TRAIT_GROUPS = frozenset({
+    "Personal Space Traits",
+    "Personal Ground Traits",
+    "space/traits/personal",
+    "ground/traits/personal",
+})
+
+
 def map_mask_type(icon_group_label_or_category):
-    if icon_group_label_or_category in [
-        "Active Space Reputation",
-        "Active Ground Reputation",
-        "Space Reputation",
-        "Ground Reputation",
-    ] or icon_group_label_or_category in [
-        "space/traits/active_reputation",
-        "ground/traits/active_reputation",
-        "space/traits/reputation",
-        "ground/traits/reputation",
-    ]:
+    if icon_group_label_or_category in REPUTATION_TRAIT_GROUPS:
         return "reputation_trait_type"
-    elif icon_group_label_or_category in [
-        "Personal Space Traits",
-        "Personal Ground Traits",
-    ] or icon_group_label_or_category in [
-        "space/traits/personal",
-        "ground/traits/personal",
-    ]:
+    elif icon_group_label_or_category in PERSONAL_TRAIT_GROUPS:
         return "personal_trait_type"
     else:
         return "item_type"
@@ -0,0 +1,73 @@
+import pytest
+import numpy as np
+import cv2
+from sister_sto.components.icon_detector import (
+    CANONICAL_ROI_SIZE,
+    match_single_icon,
+    normalize_roi,
+)
+
+@pytest.fixture
+def oversized_slot():
+    """Create an icon and a 2x slot ROI that contains it at scale 0.7, offset (4, 5)."""
+    yy, xx = np.mgrid[0:43, 0:33]
+    icon = np.dstack([
+        127 + 100 * np.sin(xx / 4.0 + c) * np.cos(yy / 5.0 - c) for c in (0, 1, 2)
+    ]).astype(np.uint8)
+
+    canvas = np.zeros(CANONICAL_ROI_SIZE + (3,), dtype=np.uint8)
+    small = cv2.resize(icon, None, fx=0.7, fy=0.7, interpolation=cv2.INTER_AREA)
+    canvas[5:5 + small.shape[0], 4:4 + small.shape[1]] = small
+
+    canon_h, canon_w = CANONICAL_ROI_SIZE
+    roi = cv2.resize(canvas, (canon_w * 2, canon_h * 2), interpolation=cv2.INTER_CUBIC)
+    return icon, roi
+
+def test_normalize_roi_keeps_canonical_size():
+    """Test that a ROI already at the canonical size is returned untouched."""
+    roi = np.zeros(CANONICAL_ROI_SIZE + (3,), dtype=np.uint8)
+    normalized, scale_factor = normalize_roi(roi)
+    assert normalized is roi
+    assert scale_factor is None
+
+@pytest.mark.parametrize('shape, expected_factor', [
+    ((94, 72, 3), 0.5),
+    ((94, 90, 3), 0.4),
+    ((60, 36, 3), 47 / 60),
+])
+def test_normalize_roi_fits_canonical_size(shape, expected_factor):
+    """Test that other ROIs are scaled to fit within the canonical size."""
+    normalized, scale_factor = normalize_roi(np.zeros(shape, dtype=np.uint8))
+    assert scale_factor == pytest.approx(expected_factor)
+    assert normalized.shape[0] <= CANONICAL_ROI_SIZE[0]
+    assert normalized.shape[1] <= CANONICAL_ROI_SIZE[1]
+    assert max(
+        normalized.shape[0] / CANONICAL_ROI_SIZE[0],
+        normalized.shape[1] / CANONICAL_ROI_SIZE[1],
+    ) == pytest.approx(1.0, abs=0.03)
+
+def test_match_single_icon_independent_of_overlay_count(oversized_slot):
+    """Test that candidate overlays tried before the match do not change the ROI it is matched in."""
+    icon, roi = oversized_slot
+    roi, scale_factor = normalize_roi(roi)
+
+    overlay = np.zeros(icon.shape[:2] + (4,), dtype=np.uint8)
+    overlays = {'rare': overlay, 'epic': overlay}
+    metadata = [{'mask_type': 'item_type'}]
+
+    def detected(name, scale):
+        return {'overlay': name, 'scale': scale, 'method': 'test', 'step_x': None, 'step_y': None}
+
+    def run(detected_overlays):
+        return match_single_icon((
+            'icon', 0, roi, scale_factor, icon, metadata, detected_overlays,
+            0.7, overlays, 'Fore Weapon', False,
+        ))
+
+    # scale 3.0 makes the template larger than the ROI, so these never match
+    single = run([detected('rare', 0.7)])
+    after_misses = run([detected('epic', 3.0), detected('epic', 3.0), detected('rare', 0.7)])
+
+    assert len(single) == 1
+    assert single[0]['score'] >= 0.7
+    assert after_misses == single
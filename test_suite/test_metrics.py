@@ -1,6 +1,8 @@
 import pytest
 import numpy as np
-from sister_sto.metrics.ms_ssim import multi_scale_match
+from skimage.metrics import structural_similarity as skimage_ssim
+from sister_sto.metrics.ms_ssim import multi_scale_match, ranked_offsets
+from sister_sto.metrics.ssim import ssim_statistics, structural_similarity
 from sister_sto.utils.image import apply_mask
 
 @pytest.fixture
@@ -80,4 +82,74 @@ def test_multi_scale_match_with_steps(sample_images):
     
     assert result is not None
     location, dimensions, score, scale, method = result
-    assert score >= 0.7 
\ No newline at end of file
+    assert score >= 0.7 
+
+@pytest.fixture
+def textured_images():
+    """Create a textured template embedded in a darker region at (7, 4)."""
+    rng = np.random.default_rng(0)
+    template = rng.integers(0, 256, (30, 24, 3), dtype=np.uint8)
+    region = rng.integers(0, 60, (47, 36, 3), dtype=np.uint8)
+    region[4:34, 7:31] = template
+    return region, template
+
+def test_ranked_offsets_best_first(textured_images):
+    """Test that the cross-correlation ranking puts the true offset first."""
+    region, template = textured_images
+    offsets = ranked_offsets(region, template, top_k=3)
+
+    assert len(offsets) == 3
+    assert offsets[0] == (7, 4)
+
+def test_ranked_offsets_exhaustive(textured_images):
+    """Test that without top_k every scanned offset is returned in raster order."""
+    region, template = textured_images
+    offsets = ranked_offsets(region, template)
+
+    assert len(offsets) == (47 - 30) * (36 - 24)
+    assert offsets[:2] == [(0, 0), (1, 0)]
+
+def test_multi_scale_match_prescreen_matches_exhaustive(textured_images):
+    """Test that the prescreened scan finds the same match as scoring every offset."""
+    region, template = textured_images
+    kwargs = dict(mask_type=None, scales=[1.0], threshold=0.5)
+
+    exhaustive = multi_scale_match("test_match", region, template, prescreen_top_k=None, **kwargs)
+    prescreened = multi_scale_match("test_match", region, template, **kwargs)
+
+    assert prescreened is not None
+    assert prescreened[0] == exhaustive[0] == (7, 4)
+    assert prescreened[2] == pytest.approx(exhaustive[2])
+
+@pytest.mark.parametrize('shape, channel_axis', [
+    ((28, 21, 3), -1),
+    ((7, 7, 3), -1),
+    ((47, 10), None),
+])
+def test_structural_similarity_matches_skimage(shape, channel_axis):
+    """Test that the OpenCV SSIM agrees with skimage's default SSIM."""
+    rng = np.random.default_rng(0)
+    im1 = rng.integers(0, 256, shape, dtype=np.uint8)
+    noise = rng.integers(-40, 40, shape)
+    im2 = np.clip(im1.astype(int) + noise, 0, 255).astype(np.uint8)
+
+    expected = skimage_ssim(im1, im2, channel_axis=channel_axis)
+    assert structural_similarity(im1, im2, channel_axis=channel_axis) == pytest.approx(expected, abs=1e-9)
+    assert structural_similarity(im1, im1, channel_axis=channel_axis) == pytest.approx(1.0)
+
+def test_structural_similarity_rejects_small_images():
+    """Test that images smaller than the 7x7 window raise ValueError, as in skimage."""
+    image = np.zeros((6, 20, 3), dtype=np.uint8)
+    with pytest.raises(ValueError):
+        structural_similarity(image, image, channel_axis=-1)
+
+def test_structural_similarity_with_precomputed_stats(textured_images):
+    """Test that reusing ssim_statistics for the template gives the same score."""
+    region, template = textured_images
+    stats = ssim_statistics(template)
+    roi = region[2:32, 5:29]
+
+    direct = structural_similarity(roi, template, channel_axis=-1)
+    reused = structural_similarity(roi, template, channel_axis=-1, im2_stats=stats)
+
+    assert reused == pytest.approx(direct, abs=1e-12)
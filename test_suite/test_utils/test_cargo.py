@@ -1,4 +1,5 @@
 import pytest
+import requests
 from pathlib import Path
 from sister_sto.utils.cargo import CargoDownloader
 import tempfile
@@ -15,6 +16,36 @@ def test_cargo_downloader_init(cargo_downloader, tmp_path):
     assert not cargo_downloader.force_download
     assert cargo_downloader.cache_dir.exists()
 
+def test_download_uses_session(cargo_downloader, monkeypatch):
+    """Test that Cargo queries go through the downloader's pooled session."""
+    class FakeResponse:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return [{"name": "Test Trait"}]
+
+    requested = []
+
+    def fake_get(url, timeout=None):
+        requested.append((url, timeout))
+        return FakeResponse()
+
+    monkeypatch.setattr(cargo_downloader.session, "get", fake_get)
+
+    cargo_downloader.download("personal_trait")
+
+    assert requested == [(cargo_downloader.build_url("personal_trait"), 10)]
+    assert cargo_downloader.load("personal_trait") == [{"name": "Test Trait"}]
+
+def test_close_closes_session(tmp_path, monkeypatch):
+    """Test that leaving the context manager closes the pooled session."""
+    with CargoDownloader(cache_dir=tmp_path) as downloader:
+        closed = []
+        monkeypatch.setattr(downloader.session, "close", lambda: closed.append(True))
+
+    assert closed == [True]
+
 def test_build_url(cargo_downloader):
     """Test URL construction for cargo queries."""
     # Test URL for equipment type
@@ -53,4 +84,97 @@ def test_cache_file_creation(cargo_downloader, cargo_type):
     # Verify content
     with open(cache_path) as f:
         loaded_data = json.load(f)
-    assert loaded_data == test_data 
\ No newline at end of file
+    assert loaded_data == test_data 
+
+def test_download_icons_streams_to_disk(cargo_downloader, tmp_path, monkeypatch):
+    """Test that icons are streamed to their final path without leftover partial files."""
+    class FakeResponse:
+        ok = True
+        status_code = 200
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def iter_content(self, chunk_size=1):
+            yield b"\x89PNG"
+            yield b"data"
+
+    requested = []
+
+    def fake_get(url, stream=False, timeout=None):
+        requested.append((url, stream, timeout))
+        return FakeResponse()
+
+    monkeypatch.setattr(cargo_downloader.session, "get", fake_get)
+
+    dest_dir = tmp_path / "icons"
+    cache_path = tmp_path / "image_cache.json"
+    cargo_downloader._download_icons(
+        [{"name": "Test Item"}], dest_dir, cache_path, "equipment",
+        on_progress=lambda *args: None
+    )
+
+    assert requested == [
+        ("https://stowiki.net/wiki/Special:FilePath/Test_Item_icon.png", True, 10)
+    ]
+    assert (dest_dir / "Test_Item.png").read_bytes() == b"\x89PNGdata"
+    assert not list(dest_dir.glob("*.part"))
+    assert json.loads(cache_path.read_text())[0]["file"] == "Test_Item.png"
+
+def test_download_icons_removes_partial_file_on_stream_error(cargo_downloader, tmp_path, monkeypatch):
+    """Test that a download failing mid-stream leaves neither an icon nor a partial file."""
+    class BrokenResponse:
+        ok = True
+        status_code = 200
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def iter_content(self, chunk_size=1):
+            yield b"\x89PNG"
+            raise requests.exceptions.ChunkedEncodingError("connection reset")
+
+    monkeypatch.setattr(
+        cargo_downloader.session, "get", lambda url, **kwargs: BrokenResponse()
+    )
+
+    dest_dir = tmp_path / "icons"
+    cargo_downloader._download_icons(
+        [{"name": "Test Item"}], dest_dir, tmp_path / "image_cache.json", "equipment",
+        on_progress=lambda *args: None
+    )
+
+    assert list(dest_dir.iterdir()) == []
+
+def test_download_icons_cleans_item_names(cargo_downloader, tmp_path, monkeypatch):
+    """Test that item names are stripped of markers and unsafe characters."""
+    class FailedResponse:
+        ok = False
+        status_code = 404
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(
+        cargo_downloader.session, "get", lambda url, **kwargs: FailedResponse()
+    )
+
+    cache_path = tmp_path / "image_cache.json"
+    cargo_downloader._download_icons(
+        [{"name": "Phaser: Beam ∞ Array Mk XII [Acc]x2 [Dmg]"}],
+        tmp_path / "icons", cache_path, "equipment",
+        on_progress=lambda *args: None
+    )
+
+    entry = json.loads(cache_path.read_text())[0]
+    assert entry["cleaned_name"] == "Phaser_ BeamArray"
+    assert entry["file"] == "Phaser__BeamArray.png"
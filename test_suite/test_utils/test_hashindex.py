@@ -1,7 +1,7 @@
 import pytest
 import numpy as np
 from PIL import Image, ImageDraw
-from sister_sto.utils.hashindex import compute_dhash, compute_phash, hamming_distance, tuple_hamming_distance
+from sister_sto.utils.hashindex import compute_dhash, compute_phash, hamming_distance, tuple_hamming_distance, compile_filters, item_matches
 
 def create_test_image(size=(32, 32), color=(255, 255, 255)):
     """Helper function to create a test image."""
@@ -101,4 +101,20 @@ def test_tuple_hamming_distance():
     tuple2 = (MockHash(15), "metadata2")
     
     distance = tuple_hamming_distance(tuple1, tuple2)
-    assert distance == 5 
\ No newline at end of file
+    assert distance == 5 
+
+@pytest.mark.parametrize('filters, item, expected', [
+    ({'type': 'Deflector, Impulse'}, {'type': 'Impulse'}, True),
+    ({'type': 'Deflector, Impulse'}, {'type': 'Warp'}, False),
+    ({'type': '!Warp'}, {'type': 'Warp'}, False),
+    ({'type': ['Warp', '!Shield']}, {'type': 'Warp'}, True),
+    ({'rarity': None}, {'rarity': None}, True),
+    ({'rarity': None}, {'rarity': 'Epic'}, False),
+    ({'name': ['A', 'B']}, {'name': ['A']}, False),
+    ({'name': '!A'}, {'name': ['A']}, True),
+    ({}, {'type': 'Warp'}, True),
+])
+def test_item_matches(filters, item, expected):
+    """Test that raw and precompiled filters give the same result."""
+    assert item_matches(item, filters) is expected
+    assert item_matches(item, compile_filters(filters)) is expected
@@ -0,0 +1,40 @@
+import pytest
+import numpy as np
+from sister_sto.utils.image import apply_mask, apply_overlay, map_mask_type
+
+@pytest.mark.parametrize('label, expected', [
+    ('Space Reputation', 'reputation_trait_type'),
+    ('ground/traits/active_reputation', 'reputation_trait_type'),
+    ('Personal Ground Traits', 'personal_trait_type'),
+    ('space/traits/personal', 'personal_trait_type'),
+    ('Starship Traits', 'item_type'),
+    ('Fore Weapon', 'item_type'),
+])
+def test_map_mask_type(label, expected):
+    """Test mask type selection for icon group labels and icon categories."""
+    assert map_mask_type(label) == expected
+
+def test_apply_overlay_blends_by_alpha():
+    """Test that each pixel is the alpha-weighted mix of overlay and template."""
+    template = np.full((10, 8, 3), 100, dtype=np.uint8)
+    overlay = np.zeros((10, 8, 4), dtype=np.uint8)
+    overlay[:, :, :3] = 200
+    overlay[:5, :, 3] = 255  # opaque top half, transparent bottom half
+
+    blended = apply_overlay(template, overlay)
+
+    assert blended.dtype == np.uint8
+    assert blended.shape == template.shape
+    assert (blended[:5] == 200).all()
+    assert (blended[5:] == 100).all()
+
+def test_apply_mask_in_place():
+    """Test that the item mask clears the lower-right corner of the image in place."""
+    image = np.full((40, 20, 3), 255, dtype=np.uint8)
+
+    result = apply_mask(image, 'item_type')
+
+    assert result is image
+    assert (image[30:, 10:] == 0).all()
+    assert (image[:30] == 255).all()
+    assert (image[:, :10] == 255).all()